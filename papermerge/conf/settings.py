@@ -42,6 +42,16 @@ if redis_host and redis_port:
             },
         },
     }
+    # Cache shared by all processes, so that cache invalidations done in
+    # one process (e.g. of user's tags list) are seen by all other
+    # processes. Without redis, Django's default per-process memory cache
+    # is used.
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f"redis://{redis_host}:{redis_port}/1",
+        }
+    }
 
 DEBUG = config.get('main', 'debug', False)
 PAPERMERGE_NAMESPACE = config.get('main', 'namespace', None)
@@ -276,9 +276,7 @@ def _rec_tar_archive(
             )
         elif node.is_folder():
 
-            child_ids = [
-                child.id for child in node.get_children()
-            ]
+            child_ids = node.get_children().values_list('id', flat=True)
             _rec_tar_archive(
                 archive,
                 child_ids,
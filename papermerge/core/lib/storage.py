@@ -1,6 +1,7 @@
 import logging
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from os import listdir
 from os.path import isdir, join
 
@@ -16,10 +17,19 @@ class Storage:
     on local host filesystem
     """
 
-    def __init__(self, location=None, **kwargs):
+    #: number of threads ``copy_pages`` uses to copy pages concurrently.
+    #: Local filesystem copies are cheap, thus they are done one by one;
+    #: storages with per file network round trips (e.g. object storages)
+    #: should raise it, either as class attribute or via
+    #: ``copy_pages_workers`` key of FILE_STORAGE_KWARGS setting.
+    copy_pages_workers = 1
+
+    def __init__(self, location=None, copy_pages_workers=None, **kwargs):
         # by default, this will be something like
         # settings.MEDIA_ROOT
         self._location = location
+        if copy_pages_workers is not None:
+            self.copy_pages_workers = copy_pages_workers
 
     @property
     def location(self):
@@ -276,6 +286,29 @@ class Storage:
         else:
             logger.debug(f"preview does not exits {src.preview_url}")
 
+    def copy_pages(self, pairs):
+        """
+        Copies data of many pages in one call
+
+        ``pairs`` is an iterable of ``(src, dst)`` tuples of PagePath
+        instances. Callers collect all pairs first and dispatch them
+        at once, so that storage backends can batch or overlap the copies
+        instead of serving them one page at a time.
+
+        With ``copy_pages_workers`` > 1 pages are copied concurrently
+        by a pool of threads.
+        """
+        if self.copy_pages_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=self.copy_pages_workers
+            ) as executor:
+                # consuming results re-raises first failed copy's exception
+                list(executor.map(lambda pair: self.copy_page(*pair), pairs))
+            return
+
+        for src, dst in pairs:
+            self.copy_page(src=src, dst=dst)
+
     def reorder_pages(self, doc_path, new_order):
         """
         Reorders pages in the document pointed by doc_path.
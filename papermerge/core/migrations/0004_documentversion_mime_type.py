@@ -0,0 +1,18 @@
+# Generated by Django 4.0.10 on 2026-10-14 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_basetreenode_polymorphic_ctype_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversion',
+            name='mime_type',
+            field=models.CharField(default='application/pdf', max_length=64),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-14 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_documentversion_mime_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='basetreenode',
+            index=models.Index(fields=['parent', 'created_at'], name='core_basetr_parent__fc85a6_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 import logging
 import os
+import magic
 from typing import Optional
 from os.path import getsize
 from pikepdf import Pdf
@@ -171,6 +172,10 @@ class Document(BaseTreeNode):
 
         document_version.file_name = file_name
         document_version.size = getsize(file_path)
+        document_version.mime_type = magic.from_file(
+            str(file_path),
+            mime=True
+        )
         document_version.page_count = len(pdf.pages)
 
         get_storage_instance().copy_doc(
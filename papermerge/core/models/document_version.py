@@ -1,6 +1,7 @@
 import os
 import uuid
 import logging
+from functools import cached_property
 
 from django.db import models
 from django.utils.translation import gettext_lazy as _
@@ -57,6 +58,13 @@ class DocumentVersion(models.Model):
         null=False,
         default=0
     )
+    #: mime type of the file, detected once when file is uploaded
+    mime_type = models.CharField(
+        max_length=64,
+        blank=False,
+        null=False,
+        default='application/pdf'
+    )
     page_count = models.IntegerField(
         blank=False,
         default=0
@@ -77,17 +85,24 @@ class DocumentVersion(models.Model):
     def __repr__(self):
         return f"DocumentVersion(id={self.pk}, number={self.number})"
 
+    @cached_property
+    def abs_document_path(self):
+        """
+        Absolute path of this document version's file
+
+        Path is resolved via storage once per instance.
+        """
+        return abs_path(self.document_path.url)
+
     def abs_file_path(self):
-        return abs_path(
-            self.document_path.url
-        )
+        return self.abs_document_path
 
     def generate_previews(self, page_number=None):
         logger.debug('generate_previews BEGIN')
         abs_dirname = abs_path(self.document_path.dirname_sidecars())
 
         kwargs = {
-            'pdf_path': abs_path(self.document_path.url),
+            'pdf_path': self.abs_document_path,
             'output_folder':  abs_dirname,
             'fmt': 'jpg',
             'size': (900,),
@@ -121,6 +136,18 @@ class DocumentVersion(models.Model):
         """
         return self != self.document.versions.last()
 
+    @cached_property
+    def page_texts(self):
+        """
+        Returns a dictionary of this version's page texts keyed by page number
+
+        Texts are fetched (only ``number`` and ``text`` columns, without
+        building Page instances) with one query, on first access, and the
+        dictionary is kept for the lifetime of this instance i.e. it does
+        not see texts changed afterwards.
+        """
+        return dict(self.pages.values_list('number', 'text'))
+
     @property
     def document_path(self):
         return DocumentPath(
@@ -178,7 +205,7 @@ class DocumentVersion(models.Model):
         """Update document versions's text field from IO streams.
 
         Arguments:
-            ``streams`` - a list of IO text streams
+            ``streams`` - a list of IO text streams or of strings
 
         It will update text field of all associated pages first
         and then concatinate all text field into doc.text field.
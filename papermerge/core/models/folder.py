@@ -23,7 +23,7 @@ class FolderQuerySet(PolymorphicMPTTQuerySet):
         for node in self:
             descendants = node.get_descendants()
 
-            if descendants.count() > 0:
+            if descendants.exists():
                 descendants.delete(*args, **kwargs)
             # At this point all descendants were deleted.
             # Self delete :)
@@ -61,12 +61,11 @@ class Folder(BaseTreeNode):
     def delete(self, *args, **kwargs):
         descendants = self.basetreenode_ptr.get_descendants()
 
-        if descendants.count() > 0:
-            for node in descendants:
-                try:
-                    node.delete(*args, **kwargs)
-                except BaseTreeNode.DoesNotExist:
-                    pass
+        for node in descendants:
+            try:
+                node.delete(*args, **kwargs)
+            except BaseTreeNode.DoesNotExist:
+                pass
         # At this point all descendants were deleted.
         # Self delete :)
         try:
@@ -34,11 +34,20 @@ class NodeManager(PolymorphicMPTTModelManager):
 
 class NodeQuerySet(PolymorphicMPTTQuerySet):
 
+    def readable_by(self, user):
+        """
+        Returns only nodes given user has read access to.
+
+        Access check is part of the SQL query, so that filtering, ordering
+        and pagination are all done by the database.
+        """
+        return self.filter(user=user)
+
     def delete(self, *args, **kwargs):
         for node in self:
             descendants = node.get_descendants()
 
-            if descendants.count() > 0:
+            if descendants.exists():
                 descendants.delete(*args, **kwargs)
             # At this point all descendants were deleted.
             # Self delete :)
@@ -142,13 +151,15 @@ class BaseTreeNode(PolymorphicMPTTModel):
         return ret
 
     def is_folder(self):
-        folder_ct = ContentType.objects.get(
+        # `get_by_natural_key` is served from ContentType manager's cache,
+        # so that only first call hits the database
+        folder_ct = ContentType.objects.get_by_natural_key(
             app_label='core', model='folder'
         )
         return self.polymorphic_ctype_id == folder_ct.id
 
     def is_document(self):
-        document_ct = ContentType.objects.get(
+        document_ct = ContentType.objects.get_by_natural_key(
             app_label='core', model='document'
         )
         return document_ct.id == self.polymorphic_ctype_id
@@ -161,6 +172,10 @@ class BaseTreeNode(PolymorphicMPTTModel):
         verbose_name = _("Documents")
         verbose_name_plural = _("Documents")
         _icon_name = 'basetreenode'
+        indexes = [
+            # folder listing: children of given parent, newest first
+            models.Index(fields=['parent', 'created_at']),
+        ]
 
 
 class AbstractNode(models.Model):
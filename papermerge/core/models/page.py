@@ -110,7 +110,7 @@ class Page(models.Model):
         return self.text.strip()
 
     def update_text_field(self, stream):
-        """Update text field from given IO stream.
+        """Update text field from given IO stream or string.
 
         Returns text read from IO stream
         """
@@ -118,7 +118,10 @@ class Page(models.Model):
             'update_text_field:'
             f'len(page.stripped_text)=={len(self.stripped_text)}'
         )
-        self.text = stream.read()
+        if isinstance(stream, str):
+            self.text = stream
+        else:
+            self.text = stream.read()
         self.save()
 
         return self.stripped_text
@@ -7,6 +7,14 @@ from papermerge.core import validators
 from taggit.models import TagBase, GenericUUIDTaggedItemBase
 from taggit.managers import TaggableManager
 
+# for how long (in seconds) list of user's tags is kept in the cache
+USER_TAGS_CACHE_TIMEOUT = 300
+
+
+def user_tags_cache_key(user_id) -> str:
+    """Returns cache key under which the list of user's tags is stored"""
+    return f"tags_user_{user_id}"
+
 
 class UserTaggableManager(TaggableManager):
     """
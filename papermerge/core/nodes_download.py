@@ -1,10 +1,15 @@
 import os
 import zipfile
 import tarfile
+from functools import cached_property
 
 from django.core.files.temp import NamedTemporaryFile
 
-from papermerge.core.models import Document, BaseTreeNode
+from papermerge.core.models import (
+    Document,
+    DocumentVersion,
+    BaseTreeNode
+)
 from papermerge.core.serializers.node import (
     ONLY_ORIGINAL,
     ONLY_LAST,
@@ -32,9 +37,20 @@ class NodesDownload:
     def _create(self):
         raise Exception("Not Implemented")
 
-    def get_content(self):
+    def get_file_handle(self):
+        """
+        Returns file handle (positioned at the beginning) of the
+        archive/document file to download.
+
+        Caller is responsible for closing returned file handle.
+        """
         file_handle = self._create()
         file_handle.seek(0)
+
+        return file_handle
+
+    def get_content(self):
+        file_handle = self.get_file_handle()
         data = file_handle.read()
         file_handle.close()
 
@@ -46,14 +62,36 @@ class NodesDownload:
     def wants_only_last(self):
         return self._include_version == ONLY_LAST
 
+    def _get_document_versions(self, document_ids):
+        """
+        Returns a dictionary which maps document ID to the document version
+        to be downloaded.
+
+        Document versions of all given documents are fetched with one
+        single query.
+        """
+        result = {}
+        doc_versions = DocumentVersion.objects.filter(
+            document_id__in=document_ids
+        ).select_related('document__user')
+
+        # document versions are ordered by number
+        for doc_version in doc_versions:
+            if self.wants_only_last() or doc_version.document_id not in result:
+                result[doc_version.document_id] = doc_version
+
+        return result
+
     def _recursive_create_archive(self, archive, node_ids, abspath):
-        for node in BaseTreeNode.objects.filter(id__in=node_ids):
+        nodes = list(BaseTreeNode.objects.filter(id__in=node_ids))
+        doc_versions = self._get_document_versions(
+            [node.id for node in nodes if node.is_document()]
+        )
+
+        for node in nodes:
             if node.is_document():
                 arcname = os.path.join(*abspath, node.idified_title)
-                if self.wants_only_last():
-                    doc_version = node.versions.last()
-                else:
-                    doc_version = node.versions.first()
+                doc_version = doc_versions[node.id]
 
                 self.archive_add(
                     archive=archive,
@@ -61,7 +99,9 @@ class NodesDownload:
                     arcname=arcname
                 )
             else:
-                child_ids = [child.id for child in node.get_children()]
+                child_ids = node.get_children().values_list(
+                    'id', flat=True
+                )
                 self._recursive_create_archive(
                     archive,
                     child_ids,
@@ -107,6 +147,8 @@ class NodesDownloadZip(NodesDownload):
             node_ids=self._node_ids,
             abspath=[]
         )
+        # writes zip's central directory; `temp_file_obj` stays open
+        archive.close()
         temp_file_obj.seek(0)
         return temp_file_obj
 
@@ -151,6 +193,8 @@ class NodesDownloadTarGz(NodesDownload):
             node_ids=self._node_ids,
             abspath=[]
         )
+        # flushes gzip stream to `temp_file_obj.name`
+        archive.close()
         temp_file_obj.seek(0)
         return temp_file_obj
 
@@ -192,16 +236,37 @@ class NodesDownloadDocument(NodesDownload):
         abs_path = self.get_document_file_abs_path()
         return open(abs_path, 'rb')
 
-    def get_document_version(self):
-        doc = Document.objects.get(pk=self._node_ids[0])
+    @cached_property
+    def document_version(self):
+        """
+        Document version to download.
+
+        Document version is fetched (together with its document and user,
+        needed to build the file path) with one query and then reused.
+        """
+        doc_versions = DocumentVersion.objects.filter(
+            document_id=self._node_ids[0]
+        ).select_related('document__user')
+
         if self.wants_only_last():
-            return doc.versions.last()
+            doc_version = doc_versions.last()
+        else:
+            doc_version = doc_versions.first()
+
+        if doc_version is None:
+            raise Document.DoesNotExist(
+                f"Document ID={self._node_ids[0]} not found"
+            )
 
-        return doc.versions.first()
+        return doc_version
+
+    def get_document_version(self):
+        """Returns document version to download"""
+        return self.document_version
 
     def get_document_file_abs_path(self):
         """Returns the absolute path to the document file to be downloaded"""
-        doc_version = self.get_document_version()
+        doc_version = self.document_version
         abs_file_path = doc_version.abs_file_path()
 
         return abs_file_path
@@ -211,14 +276,13 @@ class NodesDownloadDocument(NodesDownload):
         if self._file_name:
             return self._file_name
 
-        doc_version = self.get_document_version()
+        doc_version = self.document_version
         return doc_version.file_name
 
     @property
     def content_type(self):
-        # TODO: add correct content type depending on the
-        # document file
-        return "application/pdf"
+        doc_version = self.document_version
+        return doc_version.mime_type
 
     def __str__(self):
         return f'NodesDownloadDocument(node_ids={self._node_ids})'
@@ -5,6 +5,7 @@ from channels.layers import get_channel_layer
 from pathlib import Path
 from asgiref.sync import async_to_sync
 
+from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete, pre_delete
 from celery.signals import (
     task_received,
@@ -21,8 +22,10 @@ from papermerge.core.models import (
     Document,
     DocumentVersion,
     Folder,
+    Tag,
     User,
 )
+from papermerge.core.models.tags import user_tags_cache_key
 from papermerge.core.storage import get_storage_instance
 from .tasks import delete_user_data as delete_user_data_task
 from .tasks import (
@@ -108,6 +111,14 @@ def if_inbox_then_refresh(sender, instance, **kwargs):
         logger.warning(ex, exc_info=True)
 
 
+@receiver([post_delete, post_save], sender=Tag)
+def invalidate_user_tags_cache(sender, instance, **kwargs):
+    """
+    Removes cached list of tags of the user given tag belongs to
+    """
+    cache.delete(user_tags_cache_key(instance.user_id))
+
+
 def get_channel_data(task_name, type):
 
     if task_name == 'papermerge.core.tasks.ocr_document_task':
@@ -1,4 +1,8 @@
 import logging
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 from django.conf import settings as django_settings
 
@@ -14,14 +18,33 @@ def get_storage_class(import_path=None):
     )
 
 
+@lru_cache(maxsize=None)
 def get_storage_instance():
+    """
+    Returns storage instance built from current settings.
+
+    Instance is created on first call (i.e. after MEDIA_ROOT is set) and
+    then reused; it is discarded whenever any of the settings it was
+    built from changes (see ``clear_storage_instance``).
+    """
     storage_klass = get_storage_class()
-    storage_kwargs = settings.FILE_STORAGE_KWARGS or {}
+    # copy, so that settings.FILE_STORAGE_KWARGS is not modified in place
+    storage_kwargs = dict(settings.FILE_STORAGE_KWARGS or {})
     storage_kwargs['location'] = django_settings.MEDIA_ROOT
 
     return storage_klass(**storage_kwargs)
 
 
+@receiver(setting_changed)
+def clear_storage_instance(*, setting, **kwargs):
+    if setting in (
+        'MEDIA_ROOT',
+        f'{settings.prefix}_DEFAULT_FILE_STORAGE',
+        f'{settings.prefix}_FILE_STORAGE_KWARGS',
+    ):
+        get_storage_instance.cache_clear()
+
+
 def abs_path(some_relative_path):
     storage_instance = get_storage_instance()
 
@@ -32,7 +55,7 @@ def abs_path(some_relative_path):
 storage_class = get_storage_class()
 
 # TODO: remove this code
-storage_kwargs = settings.FILE_STORAGE_KWARGS or {}
+storage_kwargs = dict(settings.FILE_STORAGE_KWARGS or {})
 # This line will return '' if code runs before MEDIA_ROOT is being set
 # e.g. when preforking in uwsgi
 # Remove this code and access default storage only via `get_storage_instance`
@@ -1,4 +1,3 @@
-import io
 import os
 import logging
 
@@ -163,7 +162,7 @@ def update_document_pages(document_id, namespace=None):
 
     In case when a particular file with ``page.txt_url`` does not exist,
     page content (to the precise, the lack of page content) will
-    be replaced with empty string (io.String('')).
+    be replaced with empty string.
 
     In particular when no OCR was performed yet each individual
     page as well as document versions's ``text`` fields will be
@@ -177,16 +176,17 @@ def update_document_pages(document_id, namespace=None):
 
     doc = Document.objects.get(pk=document_id)
     doc_version = doc.versions.last()
-    streams = []
+    texts = []
 
     for page in doc_version.pages.order_by('number'):
         url = abs_path(page.txt_url)
         if os.path.exists(url):
-            streams.append(open(url))
+            with open(url) as f:
+                texts.append(f.read())
         else:
-            streams.append(io.StringIO(''))
+            texts.append('')
 
-    doc_version.update_text_field(streams)
+    doc_version.update_text_field(texts)
 
 
 def norm_pages_from_doc(document):
@@ -1,11 +1,9 @@
-import magic
-
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import RetrieveAPIView, GenericAPIView
 
 from django.http import (
     Http404,
-    HttpResponse
+    FileResponse
 )
 
 from papermerge.core.models import DocumentVersion
@@ -27,27 +25,27 @@ class DocumentVersionsDownloadView(RequireAuthMixin, GenericAPIView):
 
         file_abs_path = doc_ver.abs_file_path()
 
-        mime_type = magic.from_file(file_abs_path, mime=True)
         try:
             file_handle = open(file_abs_path, "rb")
         except OSError:
             raise Http404("Cannot open local version of the document")
 
-        resp = HttpResponse(
-            file_handle.read(),
-            content_type=mime_type
+        # file is streamed in chunks; FileResponse closes file handle
+        # once whole file was sent
+        resp = FileResponse(
+            file_handle,
+            content_type=doc_ver.mime_type
         )
         disposition = "attachment; filename=%s" % doc_ver.document.title
         resp['Content-Disposition'] = disposition
-        file_handle.close()
 
         return resp
 
     def get_object(self):
-        doc_ver = DocumentVersion.objects.get(
+        doc_ver = DocumentVersion.objects.select_related('document').get(
             pk=self.kwargs['pk']
         )
-        if doc_ver.document.user != self.request.user:
+        if doc_ver.document.user_id != self.request.user.pk:
             raise PermissionDenied
 
         return doc_ver
@@ -1,8 +1,10 @@
 import logging
+from collections import defaultdict
 
+from django.db.models import prefetch_related_objects
 from django.http import (
     Http404,
-    HttpResponse
+    FileResponse
 )
 from rest_framework.generics import (
     GenericAPIView,
@@ -46,6 +48,23 @@ logger = logging.getLogger(__name__)
 PER_PAGE = 30
 
 
+def prefetch_tags(nodes):
+    """
+    Prefetches tags of given (polymorphic) nodes with one query per node type.
+
+    Taggit filters tags by content type of the tagged model, thus
+    `prefetch_related('tags')` on a list mixing folders and documents would
+    find tags of only one of them; here tags are prefetched separately
+    for each node type.
+    """
+    nodes_by_model = defaultdict(list)
+    for node in nodes:
+        nodes_by_model[type(node)].append(node)
+
+    for same_model_nodes in nodes_by_model.values():
+        prefetch_related_objects(same_model_nodes, 'tags')
+
+
 class NodesViewSet(RequireAuthMixin, ModelViewSet):
     """
     Documents can be organized in folders. One folder can contain documents as
@@ -57,6 +76,9 @@ class NodesViewSet(RequireAuthMixin, ModelViewSet):
     parser_classes = [JSONAPIParser]
     renderer_classes = [JSONAPIRenderer]
     queryset = BaseTreeNode.objects.all()
+    # explicit list of sortable fields; otherwise ``OrderingFilter``
+    # instantiates the serializer on every request to derive it
+    ordering_fields = ('title', 'parent', 'created_at', 'updated_at')
     # object level permissions
     access_object_permissions = {
         'retrieve': "read",
@@ -75,10 +97,13 @@ class NodesViewSet(RequireAuthMixin, ModelViewSet):
 
         page = self.paginate_queryset(queryset)
         if page is not None:
+            prefetch_tags(page)
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
 
-        serializer = self.get_serializer(queryset, many=True)
+        nodes = list(queryset)
+        prefetch_tags(nodes)
+        serializer = self.get_serializer(nodes, many=True)
         return Response(serializer.data)
 
     def get_queryset(self, *args, **kwargs):
@@ -95,10 +120,13 @@ class NodesViewSet(RequireAuthMixin, ModelViewSet):
         if not self.request:
             return BaseTreeNode.objects.none()
 
-        return BaseTreeNode.objects.filter(
-            parent_id=self.kwargs.get('pk', None),
-            user=self.request.user
-        ).order_by('-created_at')
+        # `parent` is prefetched (instead of select_related) so that it
+        # resolves to its polymorphic `Folder` instance
+        return BaseTreeNode.objects.readable_by(
+            self.request.user
+        ).filter(
+            parent_id=self.kwargs.get('pk', None)
+        ).prefetch_related('parent').order_by('-created_at')
 
     @extend_schema(
         request=Data_NodeSerializer(),
@@ -148,11 +176,18 @@ class NodesMoveView(RequireAuthMixin, GenericAPIView):
             logger.error(exc, exc_info=True)
             return
 
-        for node in nodes:
-            try:
-                node_model = BaseTreeNode.objects.get(pk=node['id'])
-            except BaseTreeNode.DoesNotExist as exc:
-                logger.error(exc, exc_info=True)
+        node_ids = [str(node['id']) for node in nodes]
+        # fetch all nodes to move with one single query
+        node_models = {
+            str(node_model.pk): node_model
+            for node_model in BaseTreeNode.objects.filter(pk__in=node_ids)
+        }
+
+        for node_id in node_ids:
+            node_model = node_models.get(node_id, None)
+            if node_model is None:
+                logger.error(f"Node ID={node_id} not found")
+                continue
 
             node_model.refresh_from_db()  # this may take a while
             target_model.refresh_from_db()  # may take a while
@@ -164,9 +199,15 @@ class InboxCountView(RequireAuthMixin, APIView, GetClassSerializerMixin):
     class_serializer = InboxCountSerializer
 
     def get(self, request):
-        inbox_folder = request.user.inbox_folder
+        # Loads only inbox's (fresh) MPTT fields; descendants count is
+        # computed from `lft`/`rght` i.e. without an additional COUNT query
+        inbox_folder = BaseTreeNode.objects.non_polymorphic().only(
+            'lft',
+            'rght'
+        ).get(pk=request.user.inbox_folder_id)
+
         return Response({
-            'count': inbox_folder.get_descendants().count()
+            'count': inbox_folder.get_descendant_count()
         })
 
 
@@ -200,8 +241,10 @@ class NodesDownloadView(RequireAuthMixin, GenericAPIView):
             except Document.DoesNotExist as exc:
                 raise Http404 from exc
 
-            response = HttpResponse(
-                nodes_download.get_content(),
+            # archive/document file is streamed in chunks instead of
+            # being read into memory in one go
+            response = FileResponse(
+                nodes_download.get_file_handle(),
                 content_type=nodes_download.content_type
             )
             response['Content-Disposition'] = nodes_download.content_disposition
@@ -245,7 +288,9 @@ class NodeTagsView(
 
     def get_object(self):
         try:
-            node = BaseTreeNode.objects.get(pk=self.kwargs['pk'])
+            node = BaseTreeNode.objects.readable_by(
+                self.request.user
+            ).get(pk=self.kwargs['pk'])
         except BaseTreeNode.DoesNotExist as e:
             raise Http404("Node does not exist") from e
 
@@ -162,7 +162,6 @@ class PageView(RequireAuthMixin, RetrieveAPIView, DestroyAPIView):
         if instance.is_archived:
             raise APIBadRequest(detail='Deleting archived page is not allowed')
 
-        pages_to_delete = Page.objects.filter(pk__in=[instance.pk])
         old_version = instance.document_version
         doc = instance.document_version.document
 
@@ -174,12 +173,12 @@ class PageView(RequireAuthMixin, RetrieveAPIView, DestroyAPIView):
         remove_pdf_pages(
             old_version=old_version,
             new_version=new_version,
-            page_numbers=[page.number for page in pages_to_delete]
+            page_numbers=[instance.number]
         )
 
         page_recycle_map = PageRecycleMap(
             total=old_version.page_count,
-            deleted=[item.number for item in pages_to_delete]
+            deleted=[instance.number]
         )
 
         page_map = list(page_recycle_map)
@@ -223,9 +222,15 @@ class PagesView(RequireAuthMixin, GenericAPIView):
         )
 
     def delete_pages(self, page_ids):
-        pages_to_delete = Page.objects.filter(pk__in=page_ids)
+        # evaluate pages queryset only once
+        pages_to_delete = list(
+            Page.objects.filter(
+                pk__in=page_ids
+            ).select_related('document_version')
+        )
+        page_numbers = [page.number for page in pages_to_delete]
 
-        first_page = pages_to_delete.first()
+        first_page = pages_to_delete[0]
 
         for page in pages_to_delete:
             if page.is_archived:
@@ -236,25 +241,25 @@ class PagesView(RequireAuthMixin, GenericAPIView):
         old_version = first_page.document_version
 
         count = old_version.pages.count()
-        if count <= pages_to_delete.count():
+        if count <= len(pages_to_delete):
             raise APIBadRequest(
                 detail='Document version must have at least one page'
             )
 
         doc = old_version.document
         new_version = doc.version_bump(
-            page_count=old_version.page_count - pages_to_delete.count()
+            page_count=old_version.page_count - len(pages_to_delete)
         )
 
         remove_pdf_pages(
             old_version=old_version,
             new_version=new_version,
-            page_numbers=[page.number for page in pages_to_delete]
+            page_numbers=page_numbers
         )
 
         page_recycle_map = PageRecycleMap(
             total=old_version.page_count,
-            deleted=[item.number for item in pages_to_delete]
+            deleted=page_numbers
         )
 
         page_map = list(page_recycle_map)
@@ -521,14 +526,13 @@ class PagesMoveToFolderView(RequireAuthMixin, GenericAPIView):
             range(1, pages.count() + 1),
             [page.number for page in pages.order_by('number')]
         )
-        for src_page, dst_page in zip(
-            pages.order_by('number'),
-            dst_version.pages.order_by('number'),
-        ):
-            get_storage_instance().copy_page(
-                src=src_page.page_path,
-                dst=dst_page.page_path
+        get_storage_instance().copy_pages([
+            (src_page.page_path, dst_page.page_path)
+            for src_page, dst_page in zip(
+                pages.order_by('number'),
+                dst_version.pages.order_by('number'),
             )
+        ])
         reuse_text_field(
             old_version=first_page.document_version,
             new_version=dst_version,
@@ -1,14 +1,25 @@
 import logging
 
+from django.core.cache import cache
+from rest_framework.response import Response
 from rest_framework_json_api.views import ModelViewSet
 
 from papermerge.core.serializers import TagSerializer
 from papermerge.core.models import Tag
+from papermerge.core.models.tags import (
+    USER_TAGS_CACHE_TIMEOUT,
+    user_tags_cache_key
+)
 
 from .mixins import RequireAuthMixin
 
 logger = logging.getLogger(__name__)
 
+# Cached list of user's tags is used only when tags are listed without
+# filtering, sorting or searching i.e. when the only query parameters are
+# pagination parameters
+CACHEABLE_LIST_QUERY_PARAMS = {'page[number]', 'page[size]'}
+
 
 class TagsViewSet(RequireAuthMixin, ModelViewSet):
     serializer_class = TagSerializer
@@ -22,5 +33,35 @@ class TagsViewSet(RequireAuthMixin, ModelViewSet):
 
         return Tag.objects.filter(user=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        """
+        Lists tags of current user.
+
+        User's tags are cached; the cache is invalidated whenever one of
+        user's tags is saved or deleted (see `papermerge.core.signals`).
+
+        Invalidation reaches other processes only if the default cache is
+        shared between them (e.g. redis, see `papermerge.conf.settings`).
+        With a per-process cache (Django's default memory cache) other
+        processes may return stale list of tags for up to
+        `USER_TAGS_CACHE_TIMEOUT` seconds.
+        """
+        if not set(request.query_params) <= CACHEABLE_LIST_QUERY_PARAMS:
+            return super().list(request, *args, **kwargs)
+
+        tags = cache.get_or_set(
+            user_tags_cache_key(request.user.pk),
+            lambda: list(self.get_queryset()),
+            timeout=USER_TAGS_CACHE_TIMEOUT
+        )
+
+        page = self.paginate_queryset(tags)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(tags, many=True)
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         serializer.save(user_id=self.request.user.id)
@@ -1,4 +1,3 @@
-import io
 import os
 from typing import Optional, Union
 from pikepdf import Pdf
@@ -7,38 +6,31 @@ from collections import abc, namedtuple
 from django.utils.html import escape
 
 from papermerge.core.lib.path import PagePath
-from papermerge.core.storage import abs_path, get_storage_instance
+from papermerge.core.storage import get_storage_instance
 from papermerge.core.models import DocumentVersion
 
 
+KVSTORE_ALLOWED_KEYS = frozenset([
+    'id',
+    'key',
+    'value',
+    'kv_type',
+    'kv_format',
+    'kv_inherited',
+])
+
+
 def sanitize_kvstore(kvstore_dict):
     """
     Creates a sanitized dictionary.
 
     Sanitizied dictionary contains only allowed keys and escaped values.
     """
-    allowed_keys = [
-        'id',
-        'key',
-        'value',
-        'kv_type',
-        'kv_format',
-        'kv_inherited',
-    ]
-
-    sanitized_kvstore_dict = {}
-
-    for allowed_key in allowed_keys:
-        if allowed_key in kvstore_dict.keys():
-            value = kvstore_dict.get(allowed_key, None)
-            if isinstance(value, bool):
-                allowed_value = value
-            else:
-                allowed_value = escape(kvstore_dict.get(allowed_key, None))
-
-            sanitized_kvstore_dict[allowed_key] = allowed_value
-
-    return sanitized_kvstore_dict
+    return {
+        key: value if isinstance(value, bool) else escape(value)
+        for key, value in kvstore_dict.items()
+        if key in KVSTORE_ALLOWED_KEYS
+    }
 
 
 def sanitize_kvstore_list(kvstore_list):
@@ -50,11 +42,7 @@ def sanitize_kvstore_list(kvstore_list):
     if not isinstance(kvstore_list, list):
         raise ValueError("Expects list type as input")
 
-    new_kvstore_list = [
-        sanitize_kvstore(item) for item in kvstore_list
-    ]
-
-    return new_kvstore_list
+    return list(map(sanitize_kvstore, kvstore_list))
 
 
 PageRecycleMapItem = namedtuple(
@@ -140,22 +128,21 @@ class PageRecycleMap:
         self.total = total
         self.deleted = deleted
 
-        _pages = [
+        _deleted = frozenset(deleted)
+        _pages = (
             page for page in range(1, self.total + 1)
-            if page not in self.deleted
-        ]
-        _page_numbers = range(1, len(_pages) + 1)
-        self.page_map = zip(_page_numbers, _pages)
+            if page not in _deleted
+        )
+        self.page_map = iter([
+            PageRecycleMapItem(new_number, old_number)
+            for new_number, old_number in enumerate(_pages, start=1)
+        ])
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        item = next(self.page_map)
-        if item:
-            return PageRecycleMapItem(*item)
-
-        raise StopIteration
+        return next(self.page_map)
 
     def __repr__(self):
         return (
@@ -165,23 +152,16 @@ class PageRecycleMap:
         )
 
 
-def collect_text_streams(
+def collect_texts(
     version: DocumentVersion,
     page_numbers: list[int]
-) -> list[io.StringIO]:
+) -> list[str]:
     """
     Returns list of texts of given page numbers from specified document version
-
-    Each page's text is wrapped as io.StringIO instance.
     """
-    pages_map = {page.number: page for page in version.pages.all()}
-
-    result = [
-        io.StringIO(pages_map[number].text)
-        for number in page_numbers
-    ]
+    page_texts = version.page_texts
 
-    return result
+    return [page_texts[number] for number in page_numbers]
 
 
 def reuse_ocr_data_multi(
@@ -194,55 +174,43 @@ def reuse_ocr_data_multi(
     if dst_old_version is None:
         position = 0
 
-    storage = get_storage_instance()
-    page_map = [(pos, pos) for pos in range(1, position + 1)]
-
-    if len(page_map) > 0 and dst_old_version is not None:
-        for src_page_number, dst_page_number in page_map:
-            src_page_path = PagePath(
-                document_path=dst_old_version.document_path,
-                page_num=src_page_number
-            )
-            dst_page_path = PagePath(
-                document_path=dst_new_version.document_path,
-                page_num=dst_page_number
-            )
-        storage.copy_page(src=src_page_path, dst=dst_page_path)
-
-    page_map = zip(
-        page_numbers,
-        [pos for pos in range(position + 1, position + len(page_numbers) + 1)]
-    )
+    # (source document path, source page number, destination page number)
+    page_map = []
+    src_old_path = src_old_version.document_path
 
-    for src_page_number, dst_page_number in page_map:
-        src_page_path = PagePath(
-            document_path=src_old_version.document_path,
-            page_num=src_page_number
+    if dst_old_version is not None:
+        dst_old_path = dst_old_version.document_path
+        # destination's own pages before `position` keep their numbers
+        page_map.extend(
+            (dst_old_path, number, number)
+            for number in range(1, position + 1)
         )
-        dst_page_path = PagePath(
-            document_path=dst_new_version.document_path,
-            page_num=dst_page_number
+
+    # inserted pages
+    page_map.extend(
+        (src_old_path, src_number, dst_number)
+        for dst_number, src_number in enumerate(
+            page_numbers,
+            start=position + 1
         )
-        storage.copy_page(src=src_page_path, dst=dst_page_path)
+    )
 
     if dst_old_version is not None:
+        # destination's own pages after `position` are shifted
         dst_old_total_pages = dst_old_version.pages.count()
-        _range = range(
-            position + 1,
-            dst_old_total_pages + 1
+        page_map.extend(
+            (dst_old_path, number, number + len(page_numbers))
+            for number in range(position + 1, dst_old_total_pages + 1)
         )
-        page_map = [(pos, pos + len(page_numbers)) for pos in _range]
 
-        for src_page_number, dst_page_number in page_map:
-            src_page_path = PagePath(
-                document_path=dst_old_version.document_path,
-                page_num=src_page_number
-            )
-            dst_page_path = PagePath(
-                document_path=dst_new_version.document_path,
-                page_num=dst_page_number
-            )
-            storage.copy_page(src=src_page_path, dst=dst_page_path)
+    dst_new_path = dst_new_version.document_path
+    get_storage_instance().copy_pages([
+        (
+            PagePath(document_path=document_path, page_num=src_number),
+            PagePath(document_path=dst_new_path, page_num=dst_number)
+        )
+        for document_path, src_number, dst_number in page_map
+    ])
 
 
 def reuse_ocr_data(
@@ -252,19 +220,19 @@ def reuse_ocr_data(
 ) -> None:
     storage_instance = get_storage_instance()
 
-    for new_number, old_number in page_map:
-        src_page_path = PagePath(
-            document_path=old_version.document_path,
-            page_num=old_number
-        )
-        dst_page_path = PagePath(
-            document_path=new_version.document_path,
-            page_num=new_number
-        )
-        storage_instance.copy_page(
-            src=src_page_path,
-            dst=dst_page_path
+    storage_instance.copy_pages([
+        (
+            PagePath(
+                document_path=old_version.document_path,
+                page_num=old_number
+            ),
+            PagePath(
+                document_path=new_version.document_path,
+                page_num=new_number
+            )
         )
+        for new_number, old_number in page_map
+    ])
 
 
 def reuse_text_field(
@@ -272,14 +240,14 @@ def reuse_text_field(
     new_version: DocumentVersion,
     page_map: list
 ) -> None:
-    streams = collect_text_streams(
+    texts = collect_texts(
         version=old_version,
         # list of old_version page numbers
         page_numbers=[item[1] for item in page_map]
     )
 
     # updates page.text fields and document_version.text field
-    new_version.update_text_field(streams)
+    new_version.update_text_field(texts)
 
 
 def reuse_text_field_multi(
@@ -308,18 +276,17 @@ def reuse_text_field_multi(
     if dst_old_version is None:
         position = 0
 
-    page_map = [(pos, pos) for pos in range(1, position + 1)]
-    streams = []
-    if len(page_map) > 0 and dst_old_version is not None:
-        streams.extend(
-            collect_text_streams(
+    texts = []
+    if position > 0 and dst_old_version is not None:
+        texts.extend(
+            collect_texts(
                 version=dst_old_version,
-                page_numbers=[item[1] for item in page_map]
+                page_numbers=list(range(1, position + 1))
             )
         )
 
-    streams.extend(
-        collect_text_streams(
+    texts.extend(
+        collect_texts(
             version=src_old_version,
             page_numbers=page_numbers
         )
@@ -334,14 +301,14 @@ def reuse_text_field_multi(
         page_numbers_to_collect = [
             pos - len(page_numbers) for pos in _range
         ]
-        streams.extend(
-           collect_text_streams(
+        texts.extend(
+           collect_texts(
                 version=dst_old_version,
                 page_numbers=list(page_numbers_to_collect)
            )
         )
 
-    dst_new_version.update_text_field(streams)
+    dst_new_version.update_text_field(texts)
 
 
 def remove_pdf_pages(
@@ -362,23 +329,22 @@ def remove_pdf_pages(
     if len(page_numbers) < 1:
         raise ValueError("Empty page_numbers")
 
-    pdf = Pdf.open(
-        abs_path(old_version.document_path.url)
-    )
+    with Pdf.open(old_version.abs_document_path) as pdf:
+        if len(pdf.pages) < len(page_numbers):
+            raise ValueError("Too many values in page_numbers")
 
-    if len(pdf.pages) < len(page_numbers):
-        raise ValueError("Too many values in page_numbers")
+        # pages are deleted from last to first, this way deletion does not
+        # shift the numbers of the pages which are still to be deleted
+        numbers = sorted(set(page_numbers), reverse=True)
+        if numbers[-1] < 1 or numbers[0] > len(pdf.pages):
+            raise ValueError("Out of range values in page_numbers")
 
-    _deleted_count = 0
-    for page_number in page_numbers:
-        pdf.pages.remove(p=page_number - _deleted_count)
-        _deleted_count += 1
+        for page_number in numbers:
+            del pdf.pages[page_number - 1]
 
-    dirname = os.path.dirname(
-        abs_path(new_version.document_path.url)
-    )
-    os.makedirs(dirname, exist_ok=True)
-    pdf.save(abs_path(new_version.document_path.url))
+        dirname = os.path.dirname(new_version.abs_document_path)
+        os.makedirs(dirname, exist_ok=True)
+        pdf.save(new_version.abs_document_path)
 
 
 def insert_pdf_pages(
@@ -407,31 +373,32 @@ def insert_pdf_pages(
     when `src_page_numbers=[1, 2]` means insert first and second pages from
     source document version.
     """
-    src_old_pdf = Pdf.open(
-        abs_path(src_old_version.document_path.url)
-    )
     if dst_old_version is None:
         # case of total merge
-        dst_old_pdf = Pdf.new()
         dst_position = 0
-    else:
-        dst_old_pdf = Pdf.open(
-            abs_path(dst_old_version.document_path.url)
-        )
 
-    _inserted_count = 0
-    for page_number in src_page_numbers:
-        pdf_page = src_old_pdf.pages.p(page_number)
-        dst_old_pdf.pages.insert(dst_position + _inserted_count, pdf_page)
-        _inserted_count += 1
+    # both files are opened by the with statement itself, so that the first
+    # one is closed even if opening the second one fails
+    with Pdf.open(src_old_version.abs_document_path) as src_old_pdf, (
+        Pdf.new() if dst_old_version is None
+        else Pdf.open(dst_old_version.abs_document_path)
+    ) as dst_old_pdf:
+        src_page_count = len(src_old_pdf.pages)
+        if any(not 1 <= num <= src_page_count for num in src_page_numbers):
+            raise ValueError("Out of range values in src_page_numbers")
+
+        if not 0 <= dst_position <= len(dst_old_pdf.pages):
+            raise ValueError("Out of range dst_position")
+
+        # all pages are spliced in with one slice assignment
+        dst_old_pdf.pages[dst_position:dst_position] = [
+            src_old_pdf.pages.p(page_number)
+            for page_number in src_page_numbers
+        ]
 
-    dirname = os.path.dirname(
-        abs_path(dst_new_version.document_path.url)
-    )
-    os.makedirs(dirname, exist_ok=True)
-    dst_old_pdf.save(
-        abs_path(dst_new_version.document_path.url)
-    )
+        dirname = os.path.dirname(dst_new_version.abs_document_path)
+        os.makedirs(dirname, exist_ok=True)
+        dst_old_pdf.save(dst_new_version.abs_document_path)
 
 
 def total_merge(
@@ -549,20 +516,17 @@ def reorder_pdf_pages(
     pages_data,
     page_count
 ):
-    src = Pdf.open(abs_path(old_version.document_path.url))
-
-    dst = Pdf.new()
     reodered_list = sorted(pages_data, key=lambda item: item['new_number'])
 
-    for list_item in reodered_list:
-        page = src.pages.p(list_item['old_number'])
-        dst.pages.append(page)
+    with Pdf.open(old_version.abs_document_path) as src, Pdf.new() as dst:
+        dst.pages.extend(
+            src.pages.p(list_item['old_number'])
+            for list_item in reodered_list
+        )
 
-    dirname = os.path.dirname(
-        abs_path(new_version.document_path.url)
-    )
-    os.makedirs(dirname, exist_ok=True)
-    dst.save(abs_path(new_version.document_path.url))
+        dirname = os.path.dirname(new_version.abs_document_path)
+        os.makedirs(dirname, exist_ok=True)
+        dst.save(new_version.abs_document_path)
 
 
 def rotate_pdf_pages(
@@ -576,14 +540,21 @@ def rotate_pdf_pages(
         - number
         - angle
     """
-    src = Pdf.open(abs_path(old_version.document_path.url))
-
+    angles = {}
     for page_data in pages_data:
-        page = src.pages.p(page_data['number'])
-        page.rotate(page_data['angle'], relative=True)
-
-    dirname = os.path.dirname(
-        abs_path(new_version.document_path.url)
-    )
-    os.makedirs(dirname, exist_ok=True)
-    src.save(abs_path(new_version.document_path.url))
+        number = page_data['number']
+        angles[number] = angles.get(number, 0) + page_data['angle']
+
+    with Pdf.open(old_version.abs_document_path) as src:
+        if angles and (min(angles) < 1 or max(angles) > len(src.pages)):
+            raise ValueError("Out of range values in pages_data")
+
+        # single pass over the pages instead of one page tree lookup
+        # per rotated page
+        for number, page in enumerate(src.pages, start=1):
+            if number in angles:
+                page.rotate(angles[number], relative=True)
+
+        dirname = os.path.dirname(new_version.abs_document_path)
+        os.makedirs(dirname, exist_ok=True)
+        src.save(new_version.abs_document_path)
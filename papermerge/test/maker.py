@@ -34,13 +34,12 @@ def document(
         parent=user.home_folder
     )
 
-    payload = open(RESOURCES / resource, 'rb')
-
-    doc.upload(
-        payload=payload,
-        file_path=RESOURCES / resource,
-        file_name=resource
-    )
+    with open(RESOURCES / resource, 'rb') as payload:
+        doc.upload(
+            payload=payload,
+            file_path=RESOURCES / resource,
+            file_name=resource
+        )
 
     if include_ocr_data:
         _add_ocr_data(doc.versions.last())
@@ -2,7 +2,8 @@ import re
 
 from pdfminer.high_level import extract_text
 from papermerge.core.models import DocumentVersion
-from papermerge.core.storage import abs_path
+
+NON_ALPHANUMERIC = re.compile('[^0-9a-zA-Z]+')
 
 
 def pdf_content(
@@ -15,13 +16,12 @@ def pdf_content(
 
     :return: content (as string) of pdf file associated with document version
     """
-    file_path = abs_path(document_version.document_path.url)
-    text = extract_text(file_path)
+    text = extract_text(document_version.abs_document_path)
     stripped_text = text.strip()
 
     if clean:
         # replace old non-alpha numeric characters with space
-        cleaned_text = re.sub('[^0-9a-zA-Z]+', ' ', stripped_text)
+        cleaned_text = NON_ALPHANUMERIC.sub(' ', stripped_text)
         return cleaned_text
 
     return stripped_text
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from papermerge.core.lib.path import DocumentPath, PagePath
+from papermerge.core.lib.storage import Storage
+
+
+def make_page_txt(storage, page_path, text):
+    file_path = storage.abspath(page_path.txt_url)
+    storage.make_sure_path_exists(file_path)
+    with open(file_path, 'w') as f:
+        f.write(text)
+
+
+def read_page_txt(storage, page_path):
+    with open(storage.abspath(page_path.txt_url)) as f:
+        return f.read()
+
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.location = tempfile.TemporaryDirectory()
+        self.storage = Storage(location=self.location.name)
+        self.src = DocumentPath(
+            user_id=1,
+            document_id=2,
+            file_name="x.pdf"
+        )
+        self.dst = DocumentPath(
+            user_id=1,
+            document_id=3,
+            file_name="x.pdf"
+        )
+
+    def tearDown(self):
+        self.location.cleanup()
+
+    def test_copy_pages(self):
+        for number in (1, 2, 3):
+            make_page_txt(
+                self.storage,
+                PagePath(document_path=self.src, page_num=number),
+                f'page {number}'
+            )
+
+        # pages 2 and 3 of the source become pages 1 and 2 of destination
+        self.storage.copy_pages([
+            (
+                PagePath(document_path=self.src, page_num=src_number),
+                PagePath(document_path=self.dst, page_num=dst_number)
+            )
+            for src_number, dst_number in ((2, 1), (3, 2))
+        ])
+
+        for dst_number, text in ((1, 'page 2'), (2, 'page 3')):
+            page_path = PagePath(document_path=self.dst, page_num=dst_number)
+            assert read_page_txt(self.storage, page_path) == text
+
+        third_page = PagePath(document_path=self.dst, page_num=3)
+        assert not os.path.exists(self.storage.abspath(third_page.txt_url))
+
+    def test_copy_pages_concurrently(self):
+        storage = Storage(location=self.location.name, copy_pages_workers=4)
+        numbers = range(1, 11)
+        for number in numbers:
+            make_page_txt(
+                storage,
+                PagePath(document_path=self.src, page_num=number),
+                f'page {number}'
+            )
+
+        storage.copy_pages([
+            (
+                PagePath(document_path=self.src, page_num=number),
+                PagePath(document_path=self.dst, page_num=number)
+            )
+            for number in numbers
+        ])
+
+        for number in numbers:
+            page_path = PagePath(document_path=self.dst, page_num=number)
+            assert read_page_txt(storage, page_path) == f'page {number}'
+
+    def test_copy_pages_concurrently_reraises_errors(self):
+        storage = Storage(location=self.location.name, copy_pages_workers=4)
+
+        with self.assertRaises(ValueError):
+            storage.copy_pages([('not a page path', 'not a page path')])
@@ -1,4 +1,5 @@
 import io
+from unittest.mock import patch
 
 from papermerge.test import TestCase
 from papermerge.core.models import (User, Document)
@@ -227,3 +228,14 @@ class TestDocumentVersionModel(TestCase):
         # string as result
         expected = ""
         assert expected == actual
+
+    def test_abs_document_path_is_resolved_once(self):
+        doc_ver = maker.document_version(page_count=1)
+        path = 'papermerge.core.models.document_version.abs_path'
+
+        with patch(path, return_value='/some/path.pdf') as abs_path:
+            first = doc_ver.abs_document_path
+            second = doc_ver.abs_file_path()
+
+        abs_path.assert_called_once_with(doc_ver.document_path.url)
+        assert first == second == '/some/path.pdf'
@@ -51,3 +51,16 @@ class TestFolderModel(TestCase):
             parent=self.user.inbox_folder
         )
         assert self.user.inbox_folder.children.count() == 1
+
+    def test_is_folder_and_is_document(self):
+        folder = Folder.objects.create(
+            title='My Documents',
+            user=self.user
+        )
+        assert folder.is_folder()
+        assert not folder.is_document()
+
+        # content types are served from cache on subsequent calls
+        with self.assertNumQueries(0):
+            folder.is_folder()
+            folder.is_document()
@@ -32,6 +32,14 @@ class TestDocumentModel(TestCase):
 
         self.assertTrue(page.has_text)
 
+    def test_update_text_field_from_string(self):
+        self.doc_version.create_pages(page_count=1)
+        page = self.doc_version.pages.first()
+
+        page.update_text_field('Hello OCR')
+
+        self.assertEqual(page.text, 'Hello OCR')
+
     def test_stripped_text(self):
         self.doc_version.create_pages(page_count=1)
         page = self.doc_version.pages.first()
@@ -1,6 +1,13 @@
+import io
+import tarfile
+import uuid
+import zipfile
+from unittest.mock import patch
+
 from django.test import TestCase
 
-from papermerge.core.models import Document, User
+from papermerge.test import maker
+from papermerge.core.models import Document, Folder, User
 from papermerge.core.serializers.node import (
     NodesDownloadSerializer,
     TARGZ
@@ -83,3 +90,81 @@ class TestNodesDownload(TestCase):
             # should never reach this place as serialized data is
             # expected to be valid
             self.assertTrue(False)
+
+
+class TestNodesDownloadArchives(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1")
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_zip_archive_content(self, _1, _2):
+        doc1 = maker.document("s3.pdf", user=self.user)
+        doc2 = maker.document("three-pages.pdf", user=self.user)
+        download = NodesDownloadZip(node_ids=[doc1.id, doc2.id])
+
+        archive = zipfile.ZipFile(io.BytesIO(download.get_content()))
+
+        assert archive.testzip() is None
+        assert set(archive.namelist()) == {
+            doc1.idified_title,
+            doc2.idified_title
+        }
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_targz_archive_content(self, _1, _2):
+        doc1 = maker.document("s3.pdf", user=self.user)
+        doc2 = maker.document("three-pages.pdf", user=self.user)
+        download = NodesDownloadTarGz(node_ids=[doc1.id, doc2.id])
+
+        archive = tarfile.open(
+            fileobj=io.BytesIO(download.get_content()),
+            mode='r:gz'
+        )
+
+        assert set(archive.getnames()) == {
+            doc1.idified_title,
+            doc2.idified_title
+        }
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_zip_archive_preserves_folder_structure(self, _1, _2):
+        folder = Folder.objects.create(
+            title='invoices',
+            user=self.user,
+            parent=self.user.home_folder
+        )
+        doc1 = maker.document("s3.pdf", user=self.user)
+        doc2 = maker.document("three-pages.pdf", user=self.user)
+        folder.refresh_from_db()
+        Document.objects.move_node(doc2, folder)
+        download = NodesDownloadZip(node_ids=[doc1.id, folder.id])
+
+        archive = zipfile.ZipFile(io.BytesIO(download.get_content()))
+
+        assert set(archive.namelist()) == {
+            doc1.idified_title,
+            f'{folder.idified_title}/{doc2.idified_title}'
+        }
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_document_download_content(self, _1, _2):
+        doc = maker.document("s3.pdf", user=self.user)
+        download = NodesDownloadDocument(node_ids=[doc.id])
+
+        assert download.file_name == 's3.pdf'
+        # document version is fetched only once
+        with self.assertNumQueries(0):
+            content = download.get_content()
+
+        with open(doc.versions.last().abs_file_path(), 'rb') as file:
+            assert content == file.read()
+
+    def test_document_download_of_non_existing_document(self):
+        download = NodesDownloadDocument(node_ids=[uuid.uuid4()])
+
+        with self.assertRaises(Document.DoesNotExist):
+            download.get_content()
@@ -0,0 +1,29 @@
+from django.test import override_settings
+
+from papermerge.test import TestCase
+from papermerge.core.storage import get_storage_instance
+
+
+class TestGetStorageInstance(TestCase):
+
+    def test_storage_instance_is_reused(self):
+        assert get_storage_instance() is get_storage_instance()
+
+    def test_storage_instance_follows_media_root(self):
+        default_instance = get_storage_instance()
+
+        with override_settings(MEDIA_ROOT='/tmp/other_media_root'):
+            instance = get_storage_instance()
+            assert instance is not default_instance
+            assert instance.location == '/tmp/other_media_root'
+
+        assert get_storage_instance().location == default_instance.location
+
+    def test_storage_kwargs_setting_is_not_modified(self):
+        storage_kwargs = {'copy_pages_workers': 2}
+
+        with override_settings(PAPERMERGE_FILE_STORAGE_KWARGS=storage_kwargs):
+            instance = get_storage_instance()
+
+        assert instance.copy_pages_workers == 2
+        assert storage_kwargs == {'copy_pages_workers': 2}
@@ -82,5 +82,28 @@ class DownloadDocumentVersionOnlyOwner(TestCase):
 
         with open(abs_path(doc_ver.document_path.path), 'rb') as file:
             expected_content = file.read()
+            content = b''.join(response.streaming_content)
             # entire document was downloaded
-            assert len(response.content) == len(expected_content)
+            assert len(content) == len(expected_content)
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_download_document_version_uses_stored_mime_type(self, _1, _2):
+        """
+        Asserts that download sends mime type detected on upload and
+        does not inspect the file again
+        """
+        doc = maker.document(
+            "s3.pdf",
+            user=self.owner
+        )
+        doc_ver = doc.versions.last()
+        assert doc_ver.mime_type == 'application/pdf'
+        url = reverse('download-document-version', args=(doc_ver.pk,))
+
+        with patch('magic.from_file') as from_file:
+            response = self.client_owner.get(url)
+            from_file.assert_not_called()
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/pdf'
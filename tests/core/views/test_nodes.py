@@ -1,8 +1,12 @@
 import json
+from unittest.mock import patch
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from model_bakery import baker
 
-from papermerge.test import TestCase
+from papermerge.test import TestCase, maker
 from papermerge.core.models import (
     Folder,
     Document,
@@ -43,6 +47,26 @@ class NodesViewTestCase(TestCase):
         # user's inbox contains one item
         assert response.data == {'count': 1}
 
+    def test_get_inboxcount_with_nested_items_in_inbox(self):
+        """
+        GET /nodes/inboxcount/ counts all descendants of user's inbox,
+        not only its immediate children.
+        """
+        folder = Folder.objects.create(
+            title='I am inside .inbox',
+            user=self.user,
+            parent=self.user.inbox_folder
+        )
+        Folder.objects.create(
+            title='I am inside a folder inside .inbox',
+            user=self.user,
+            parent=folder
+        )
+        response = self.client.get(reverse('inboxcount'))
+        assert response.status_code == 200
+
+        assert response.data == {'count': 2}
+
     def test_assign_tags_to_non_tagged_folder(self):
         """
         url:
@@ -185,6 +209,28 @@ class NodesViewTestCase(TestCase):
         all_new_tags = [tag.name for tag in receipts.tags.all()]
         assert set(all_new_tags) == set(['paid', 'bakery', 'receipt'])
 
+    def test_assign_tags_to_folder_of_another_user(self):
+        """
+        url:
+            POST /api/nodes/{N1}/tags/
+
+        where N1 is a folder owned by another user
+
+        Expected result:
+            404 response; no tags are assigned to folder N1
+        """
+        john = baker.make('core.user')
+        receipts = Folder.objects.create(
+            title='Receipts',
+            user=john,
+            parent=john.inbox_folder
+        )
+        url = reverse('node-tags', args=(receipts.pk, ))
+        response = self.post(url, {'tags': ['paid']})
+
+        assert response.status_code == 404
+        assert receipts.tags.count() == 0
+
     def test_home_with_two_tagged_nodes(self):
         """
         Create two tagged nodes (one folder and one document) in user's home.
@@ -223,6 +269,78 @@ class NodesViewTestCase(TestCase):
         assert set(['doc_a', 'doc_b']) == set(doc_tag_names)
         assert set(['folder_a', 'folder_b']) == set(folder_tag_names)
 
+    def test_home_listing_number_of_queries(self):
+        """
+        Number of SQL queries issued when retrieving folder's content
+        does not depend on number of nodes in that folder (i.e. node's
+        `parent` and `tags` are not fetched one node at a time).
+        """
+        home = self.user.home_folder
+        url = reverse('node-detail', args=(home.pk, ))
+
+        def create_tagged_nodes(count):
+            for index in range(count):
+                folder = Folder.objects.create(
+                    title=f'folder-{index}',
+                    user=self.user,
+                    parent=home
+                )
+                folder.tags.set(['a', 'b'], tag_kwargs={"user": self.user})
+
+        create_tagged_nodes(1)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        queries_count_for_one_node = len(ctx.captured_queries)
+
+        create_tagged_nodes(4)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+
+        assert response.status_code == 200
+        assert len(response.data['results']) == 5
+        assert len(ctx.captured_queries) == queries_count_for_one_node
+
+        for result in response.data['results']:
+            assert result['parent']['type'] == 'folders'
+            assert result['parent']['id'] == str(home.pk)
+            assert set(tag['name'] for tag in result['tags']) == {'a', 'b'}
+
+    def test_empty_folder_listing_is_single_query(self):
+        """
+        Listing of an empty folder costs only the pagination's count query
+        """
+        folder = Folder.objects.create(
+            title='empty',
+            user=self.user,
+            parent=self.user.home_folder
+        )
+        url = reverse('node-detail', args=(folder.pk, ))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        assert response.status_code == 200
+        assert response.data['results'] == []
+
+    def test_home_listing_sorted_by_title(self):
+        home = self.user.home_folder
+        for title in ('b', 'c', 'a'):
+            Folder.objects.create(title=title, user=self.user, parent=home)
+        url = reverse('node-detail', args=(home.pk, ))
+
+        response = self.client.get(url, {'sort': '-title'})
+
+        assert response.status_code == 200
+        titles = [node['title'] for node in response.data['results']]
+        assert titles == ['c', 'b', 'a']
+
+    def test_home_listing_sorted_by_invalid_field(self):
+        url = reverse('node-detail', args=(self.user.home_folder.pk, ))
+
+        response = self.client.get(url, {'sort': 'user'})
+
+        assert response.status_code == 400
+
     def test_nodes_move(self):
         doc = Document.objects.create(
             title='doc.pdf',
@@ -248,6 +366,57 @@ class NodesViewTestCase(TestCase):
 
         assert response.status_code == 200, response.data
 
+    def test_nodes_move_multiple_nodes(self):
+        doc = Document.objects.create(
+            title='doc.pdf',
+            user=self.user,
+            parent=self.user.inbox_folder
+        )
+        folder = Folder.objects.create(
+            title='folder',
+            user=self.user,
+            parent=self.user.inbox_folder
+        )
+
+        url = reverse('nodes-move')
+        data = {
+            'nodes': [
+                {'id': str(doc.id)},
+                {'id': str(folder.id)}
+            ],
+            'target_parent': {
+                'id': str(self.user.home_folder.id)
+            }
+        }
+
+        response = self.client.post(
+            url,
+            json.dumps(data),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 200, response.data
+        doc.refresh_from_db()
+        folder.refresh_from_db()
+        assert doc.parent_id == self.user.home_folder.id
+        assert folder.parent_id == self.user.home_folder.id
+        assert self.user.inbox_folder.get_children().count() == 0
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_nodes_download_single_document(self, _1, _2):
+        doc = maker.document("s3.pdf", user=self.user)
+
+        response = self.client.get(
+            '/api/nodes/download/',
+            {'node_ids': [str(doc.id)]}
+        )
+
+        assert response.status_code == 200
+        assert response.streaming
+        with open(doc.versions.last().abs_file_path(), 'rb') as file:
+            assert b''.join(response.streaming_content) == file.read()
+
     def test_create_document(self):
         """
         When 'lang' attribute is not specified during document creation
@@ -77,3 +77,44 @@ class TagsViewTestCase(TestCase):
         assert response.status_code == 400, response.data
         assert 'already exists' in response.data[0]['detail']
         assert Tag.objects.count() == 1
+
+    def test_list_tags_reflects_tag_changes(self):
+        """
+        List of user's tags is cached; saving or deleting a tag
+        invalidates the cached list.
+        """
+        tag = Tag.objects.create(name='paid', user=self.user)
+
+        response = self.client.get(reverse('tag-list'))
+        assert response.status_code == 200
+        assert [item['name'] for item in response.data['results']] == [
+            'paid'
+        ]
+
+        Tag.objects.create(name='important', user=self.user)
+        tag.name = 'unpaid'
+        tag.save()
+
+        response = self.client.get(reverse('tag-list'))
+        assert [item['name'] for item in response.data['results']] == [
+            'important', 'unpaid'
+        ]
+
+        tag.delete()
+
+        response = self.client.get(reverse('tag-list'))
+        assert [item['name'] for item in response.data['results']] == [
+            'important'
+        ]
+
+    def test_list_tags_of_current_user_only(self):
+        john = User.objects.create_user(username="john")
+        Tag.objects.create(name='paid', user=self.user)
+        Tag.objects.create(name='johns-tag', user=john)
+
+        response = self.client.get(reverse('tag-list'))
+
+        assert response.status_code == 200
+        assert [item['name'] for item in response.data['results']] == [
+            'paid'
+        ]
@@ -1,7 +1,9 @@
+import os
 from unittest.mock import patch
 import itertools
 import pytest
 
+from pikepdf import Pdf
 from model_bakery import baker
 
 from papermerge.test import TestCase
@@ -13,17 +15,46 @@ from papermerge.core.views.utils import (
     partial_merge,
     insert_pdf_pages,
     remove_pdf_pages,
-    collect_text_streams,
+    reorder_pdf_pages,
+    rotate_pdf_pages,
+    collect_texts,
     reuse_text_field,
     reuse_text_field_multi,
     reuse_ocr_data,
     reuse_ocr_data_multi,
+    sanitize_kvstore,
+    sanitize_kvstore_list,
     PageRecycleMap
 )
 from papermerge.core.models import Document, Page
 from papermerge.core.storage import abs_path
 
 
+class TestSanitizeKVStore(TestCase):
+
+    def test_sanitize_kvstore(self):
+        result = sanitize_kvstore({
+            'key': 'shop',
+            'value': '<b>Aldi</b>',
+            'kv_inherited': True,
+            'not_allowed': 'junk'
+        })
+
+        assert result == {
+            'key': 'shop',
+            'value': '&lt;b&gt;Aldi&lt;/b&gt;',
+            'kv_inherited': True
+        }
+
+    def test_sanitize_kvstore_list(self):
+        result = sanitize_kvstore_list([{'key': 'a&b'}, {'junk': 'x'}])
+
+        assert result == [{'key': 'a&amp;b'}, {}]
+
+        with pytest.raises(ValueError):
+            sanitize_kvstore_list({'key': 'a'})
+
+
 class TestPageRecycleMap(TestCase):
 
     def test_page_recycle_map_1(self):
@@ -49,6 +80,14 @@ class TestPageRecycleMap(TestCase):
 
         assert result == [(1, 2), (2, 3), (3, 4), (4, 5)]
 
+    def test_page_recycle_map_unsorted_deleted(self):
+        page_map = PageRecycleMap(
+            total=6, deleted=[5, 2, 3]
+        )
+        result = [(item.new_number, item.old_number) for item in page_map]
+
+        assert result == [(1, 1), (2, 4), (3, 6)]
+
     def test_page_recycle_map_junk_arguments(self):
         """
         `deleted_pages` argument is expected to be a list.
@@ -92,10 +131,10 @@ class TestPageRecycleMap(TestCase):
         assert list_1 == list_2
 
 
-class TestCollectTextStreams(TestCase):
-    """Tests collect_text_streams"""
+class TestCollectTexts(TestCase):
+    """Tests collect_texts"""
 
-    def test_collect_text_streams_basic_1(self):
+    def test_collect_texts_basic_1(self):
         pages = baker.prepare(
             "core.Page",
             _quantity=3,
@@ -107,19 +146,16 @@ class TestCollectTextStreams(TestCase):
             pages=pages
         )
 
-        actual = [
-            stream.read()
-            for stream in collect_text_streams(
-                version=doc_version,
-                page_numbers=[2, 3]
-            )
-        ]
+        actual = collect_texts(
+            version=doc_version,
+            page_numbers=[2, 3]
+        )
 
         expected = ["Page 2", "Page 3"]
 
         assert expected == actual
 
-    def test_collect_text_streams_basic_2(self):
+    def test_collect_texts_basic_2(self):
         pages = baker.prepare(
             "core.Page",
             _quantity=2,
@@ -131,18 +167,40 @@ class TestCollectTextStreams(TestCase):
             pages=pages
         )
 
-        actual = [
-            stream.read()
-            for stream in collect_text_streams(
-                version=doc_version,
-                page_numbers=[1, 2]
-            )
-        ]
+        actual = collect_texts(
+            version=doc_version,
+            page_numbers=[1, 2]
+        )
 
         expected = ["Page 1", "Page 2"]
 
         assert expected == actual
 
+    def test_collect_texts_fetches_pages_once(self):
+        pages = baker.prepare(
+            "core.Page",
+            _quantity=3,
+            number=itertools.cycle([1, 2, 3]),
+            text=itertools.cycle(["Page 1", "Page 2", "Page 3"])
+        )
+        doc_version = baker.make(
+            "core.DocumentVersion",
+            pages=pages
+        )
+
+        with self.assertNumQueries(1):
+            first = collect_texts(
+                version=doc_version,
+                page_numbers=[1]
+            )
+            second = collect_texts(
+                version=doc_version,
+                page_numbers=[2, 3]
+            )
+
+        assert ["Page 1"] == first
+        assert ["Page 2", "Page 3"] == second
+
 
 class TestReuseOCRdata(TestCase):
     """Tests for reuse_ocr_data"""
@@ -427,6 +485,66 @@ class TestReuseOCRDataMulti(TestCase):
             message="src_2_page[2] != dst_page[4]"
         )
 
+    def test_reuse_ocr_data_multi_5(self):
+        """
+        In this scenario we reuse ocr data from page 3.
+        Page 3 was moved to destination to position 2 i.e. there are
+        two destination pages before inserted one:
+
+        src 1/src old  | src 2/dst old |  dst / result
+        -----------------------------------------------
+               1       |      i        |      i
+               2       |      ii       |      ii
+               3       |      iii      |      3
+                       |               |      iii
+        """
+        src_old_version = maker.document_version(
+            page_count=3,
+            pages_text=[
+                "old src page 1",
+                "old src page 2",
+                "old src page 3",
+            ],
+            include_ocr_data=True
+        )
+        dst_old_version = maker.document_version(
+            page_count=3,
+            pages_text=[
+                "old dst page 1",
+                "old dst page 2",
+                "old dst page 3",
+            ],
+            include_ocr_data=True
+        )
+        dst_new_version = maker.document_version(
+            page_count=4,
+            include_ocr_data=True
+        )
+
+        #  this is what is tested
+        reuse_ocr_data_multi(
+            src_old_version=src_old_version,
+            dst_old_version=dst_old_version,
+            dst_new_version=dst_new_version,
+            page_numbers=[3],
+            position=2
+        )
+
+        dst_old_pages = dst_old_version.pages.all()
+        dst_new_pages = dst_new_version.pages.all()
+        expected = [
+            (dst_old_pages[0], dst_new_pages[0]),
+            (dst_old_pages[1], dst_new_pages[1]),
+            (src_old_version.pages.all()[2], dst_new_pages[2]),
+            (dst_old_pages[2], dst_new_pages[3]),
+        ]
+        for index, (src_page, dst_page) in enumerate(expected):
+            _assert_same_ocr_data(
+                src=src_page,
+                dst=dst_page,
+                message=f"dst_page[{index}] has wrong OCR data"
+            )
+
 
 class TestReuseTextFieldMulti(TestCase):
     """Tests for reuse_text_field_multi"""
@@ -759,6 +877,26 @@ class TestRemovePdfPages(TestCase):
         content = pdf_content(src_new_version, clean=True)
         assert content == "S1"
 
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_remove_pdf_pages_unsorted_input(self, _, _x):
+        """Page numbers to remove may come in any order"""
+        src_document = maker.document(
+            "s3.pdf",
+            user=self.user
+        )
+        src_old_version = src_document.versions.last()
+        src_new_version = src_document.version_bump(page_count=1)
+
+        remove_pdf_pages(
+            old_version=src_old_version,
+            new_version=src_new_version,
+            page_numbers=[3, 1]
+        )
+
+        content = pdf_content(src_new_version, clean=True)
+        assert content == "S2"
+
     @patch('papermerge.core.signals.ocr_document_task')
     @patch('papermerge.core.signals.generate_page_previews_task')
     def test_remove_pdf_pages_invalid_input(self, _, _x):
@@ -784,6 +922,20 @@ class TestRemovePdfPages(TestCase):
                 page_numbers=[1, 2, 3, 4, 5, 6, 7]  # invalid, too many values
             )
 
+        with pytest.raises(ValueError):
+            remove_pdf_pages(
+                old_version=src_old_version,
+                new_version=src_new_version,
+                page_numbers=[2, 4]  # invalid, there is no page 4
+            )
+
+        with pytest.raises(ValueError):
+            remove_pdf_pages(
+                old_version=src_old_version,
+                new_version=src_new_version,
+                page_numbers=[0]  # invalid, numbering starts with 1
+            )
+
 
 class TestInserPdfPagesUtilityFunction(TestCase):
     """Tests for insert_pdf_pages"""
@@ -899,6 +1051,197 @@ class TestInserPdfPagesUtilityFunction(TestCase):
         dst_new_content = pdf_content(dst_new_version, clean=True)
         assert "S1 S3" == dst_new_content
 
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_insert_pdf_pages_at_the_end(self, _, _x):
+        """
+        Source pages inserted at position equal to destination's page count
+        are appended after all destination pages
+        """
+        src_document = maker.document(
+            "s3.pdf",
+            user=self.user
+        )
+        src_old_version = src_document.versions.last()
+        dst_document = maker.document(
+            "d3.pdf",
+            user=self.user
+        )
+        dst_new_version = dst_document.version_bump(page_count=5)
+        dst_old_version = dst_document.versions.first()
+
+        insert_pdf_pages(
+            src_old_version=src_old_version,
+            dst_old_version=dst_old_version,
+            dst_new_version=dst_new_version,
+            src_page_numbers=[2, 3],
+            dst_position=3
+        )
+
+        dst_new_content = pdf_content(dst_new_version, clean=True)
+        assert "D1 D2 D3 S2 S3" == dst_new_content
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_insert_pdf_pages_invalid_input(self, _, _x):
+        src_document = maker.document(
+            "s3.pdf",
+            user=self.user
+        )
+        src_old_version = src_document.versions.last()
+        dst_document = maker.document(
+            "d3.pdf",
+            user=self.user
+        )
+        dst_new_version = dst_document.version_bump(page_count=4)
+        dst_old_version = dst_document.versions.first()
+
+        with pytest.raises(ValueError):
+            insert_pdf_pages(
+                src_old_version=src_old_version,
+                dst_old_version=dst_old_version,
+                dst_new_version=dst_new_version,
+                src_page_numbers=[4],  # invalid, source has 3 pages
+                dst_position=0
+            )
+
+        with pytest.raises(ValueError):
+            insert_pdf_pages(
+                src_old_version=src_old_version,
+                dst_old_version=dst_old_version,
+                dst_new_version=dst_new_version,
+                src_page_numbers=[1],
+                dst_position=4  # invalid, destination has 3 pages
+            )
+
+        # nothing was written to destination
+        assert not os.path.exists(dst_new_version.abs_document_path)
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_insert_pdf_pages_closes_files_if_open_fails(self, _, _x):
+        """
+        If opening either source or destination file fails, the file
+        which was already opened is closed
+        """
+        src_document = maker.document(
+            "s3.pdf",
+            user=self.user
+        )
+        src_old_version = src_document.versions.last()
+        dst_document = maker.document(
+            "d3.pdf",
+            user=self.user
+        )
+        dst_new_version = dst_document.version_bump(page_count=5)
+        dst_old_version = dst_document.versions.first()
+        real_open = Pdf.open
+
+        for broken_version in (src_old_version, dst_old_version):
+            opened = []
+
+            def open_or_fail(path, *args, **kwargs):
+                if path == broken_version.abs_document_path:
+                    raise OSError(f"Cannot open {path}")
+                pdf = real_open(path, *args, **kwargs)
+                opened.append(pdf)
+                return pdf
+
+            with patch.object(Pdf, 'open', side_effect=open_or_fail), \
+                    patch.object(Pdf, 'close', autospec=True) as close:
+                with pytest.raises(OSError):
+                    insert_pdf_pages(
+                        src_old_version=src_old_version,
+                        dst_old_version=dst_old_version,
+                        dst_new_version=dst_new_version,
+                        src_page_numbers=[1],
+                        dst_position=0
+                    )
+
+            closed = [call.args[0] for call in close.call_args_list]
+            assert closed == opened
+            for pdf in opened:
+                pdf.close()
+
+        assert not os.path.exists(dst_new_version.abs_document_path)
+
+
+class TestReorderPdfPagesUtilityFunction(TestCase):
+    """Tests for reorder_pdf_pages"""
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_reorder_pdf_pages(self, _, _x):
+        document = maker.document(
+            "s3.pdf",
+            user=self.user
+        )
+        old_version = document.versions.last()
+        new_version = document.version_bump()
+
+        reorder_pdf_pages(
+            old_version=old_version,
+            new_version=new_version,
+            pages_data=[
+                {'old_number': 1, 'new_number': 3},
+                {'old_number': 2, 'new_number': 1},
+                {'old_number': 3, 'new_number': 2},
+            ],
+            page_count=3
+        )
+
+        assert "S2 S3 S1" == pdf_content(new_version, clean=True)
+
+
+class TestRotatePdfPagesUtilityFunction(TestCase):
+    """Tests for rotate_pdf_pages"""
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_rotate_pdf_pages(self, _, _x):
+        document = maker.document(
+            "s3.pdf",
+            user=self.user
+        )
+        old_version = document.versions.last()
+        new_version = document.version_bump()
+
+        rotate_pdf_pages(
+            old_version=old_version,
+            new_version=new_version,
+            pages_data=[
+                {'number': 3, 'angle': 90},
+                {'number': 1, 'angle': 180},
+                {'number': 3, 'angle': 90},
+            ]
+        )
+
+        with Pdf.open(new_version.abs_document_path) as pdf:
+            rotations = [page.get('/Rotate', 0) for page in pdf.pages]
+
+        # angles given for the same page add up
+        assert rotations == [180, 0, 180]
+        assert "S1 S2 S3" == pdf_content(new_version, clean=True)
+
+    @patch('papermerge.core.signals.ocr_document_task')
+    @patch('papermerge.core.signals.generate_page_previews_task')
+    def test_rotate_pdf_pages_out_of_range(self, _, _x):
+        document = maker.document(
+            "s3.pdf",
+            user=self.user
+        )
+        old_version = document.versions.last()
+        new_version = document.version_bump()
+
+        with pytest.raises(ValueError):
+            rotate_pdf_pages(
+                old_version=old_version,
+                new_version=new_version,
+                pages_data=[{'number': 4, 'angle': 90}]
+            )
+
+        assert not os.path.exists(new_version.abs_document_path)
+
 
 class TestUtils(TestCase):
 